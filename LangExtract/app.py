@@ -1,11 +1,21 @@
 import streamlit as st
-import langextract as lx
+import pandas as pd
+import atexit
+import copy
+import functools
+import hashlib
 import json
 import os
+import re
+import shutil
+import sys
 import tempfile
-from dotenv import load_dotenv
+import urllib.request
+from collections import Counter
+from types import MappingProxyType
 
-load_dotenv()
+# langextract (and its Google/OpenAI SDK dependency tree) is imported lazily
+# inside the helpers that need it — keeps script startup and hot-reload fast.
 
 # ---------------------------------------------------------------------------
 # Page config
@@ -17,13 +27,25 @@ st.set_page_config(
     initial_sidebar_state="expanded",
 )
 
+
+@st.cache_resource
+def _env():
+    """Parse .env and read API keys once per process instead of per rerun."""
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    return {
+        "gemini": os.getenv("LANGEXTRACT_API_KEY", ""),
+        "openai": os.getenv("OPENAI_API_KEY", ""),
+    }
+
 # ---------------------------------------------------------------------------
 # Session state defaults
 # ---------------------------------------------------------------------------
 if "extraction_result" not in st.session_state:
     st.session_state["extraction_result"] = None
-if "visualization_html" not in st.session_state:
-    st.session_state["visualization_html"] = None
+if "visualization_path" not in st.session_state:
+    st.session_state["visualization_path"] = None
 if "examples" not in st.session_state:
     st.session_state["examples"] = []
 if "results_path" not in st.session_state:
@@ -43,7 +65,7 @@ PRESET_NAMES = [
     "🔗 Knowledge Graph Entities",
 ]
 
-PRESETS = {
+_PRESET_DATA = {
     "🎭 Character Analysis (Literature)": {
         "prompt": "Extract characters, their emotional states, and relationships in order of appearance.",
         "classes": "character",
@@ -116,6 +138,17 @@ PRESETS = {
     },
 }
 
+# Intern the class names so downstream membership/equality checks compare
+# pointers rather than characters.
+for _preset in _PRESET_DATA.values():
+    for _ex in _preset["examples"]:
+        for _ext in _ex["extractions"]:
+            _ext["extraction_class"] = sys.intern(_ext["extraction_class"])
+
+# Freeze the presets — they are shared module-level constants and must never
+# be mutated by session-level edits.
+PRESETS = MappingProxyType({k: MappingProxyType(v) for k, v in _PRESET_DATA.items()})
+
 
 def load_preset_callback():
     """Called when preset selectbox changes — loads data into session state."""
@@ -124,7 +157,8 @@ def load_preset_callback():
         preset = PRESETS[choice]
         st.session_state["prompt_text"] = preset["prompt"]
         st.session_state["classes_text"] = preset["classes"]
-        st.session_state["examples"] = preset["examples"]
+        # Deep-copy so Remove/Clear in the session can't mutate the preset.
+        st.session_state["examples"] = copy.deepcopy(preset["examples"])
         st.session_state["loaded_preset"] = choice
 
 
@@ -145,7 +179,7 @@ api_provider = st.sidebar.selectbox(
 if api_provider == "Gemini (Google)":
     api_key = st.sidebar.text_input(
         "Gemini API Key",
-        value=os.getenv("LANGEXTRACT_API_KEY", ""),
+        value=_env()["gemini"],
         type="password",
         help="Set LANGEXTRACT_API_KEY env var or paste here.",
     )
@@ -156,7 +190,7 @@ if api_provider == "Gemini (Google)":
 elif api_provider == "OpenAI":
     api_key = st.sidebar.text_input(
         "OpenAI API Key",
-        value=os.getenv("OPENAI_API_KEY", ""),
+        value=_env()["openai"],
         type="password",
     )
     model_options = ["gpt-4o", "gpt-4o-mini"]
@@ -243,28 +277,54 @@ available_classes = [c.strip() for c in classes_value.split(",") if c.strip()] i
 # ===========================================================================
 st.header("Step 2: Few-Shot Examples")
 
-if st.session_state["examples"]:
+
+@st.fragment
+def _examples_fragment():
+    """Render the loaded examples list; reruns in isolation from the page."""
+    if not st.session_state["examples"]:
+        st.warning("⚠️ No examples loaded yet. **Select a preset above** (easiest) or add one manually below.")
+        return
+
     st.markdown(f"**{len(st.session_state['examples'])} example(s) loaded.**")
     for i, ex in enumerate(st.session_state["examples"]):
         with st.expander(f"📋 Example {i + 1}: _{ex['text'][:80]}..._", expanded=True):
             st.markdown("**Example text:**")
             st.code(ex["text"], language=None)
             st.markdown("**Expected extractions:**")
-            for j, ext in enumerate(ex["extractions"]):
-                attr_str = ""
-                if ext.get("attributes"):
-                    attr_str = "  →  " + ", ".join(f"`{k}={v}`" for k, v in ext["attributes"].items())
-                st.markdown(f"  {j+1}. **[{ext['extraction_class']}]** `{ext['extraction_text']}`{attr_str}")
+            # One dataframe per example instead of one markdown element per
+            # extraction — a single message to the browser regardless of size.
+            df = pd.DataFrame(
+                [
+                    {
+                        "#": j + 1,
+                        "class": ext["extraction_class"],
+                        "text": ext["extraction_text"],
+                        "attributes": ", ".join(f"{k}={v}" for k, v in ext.get("attributes", {}).items()),
+                    }
+                    for j, ext in enumerate(ex["extractions"])
+                ]
+            )
+            st.dataframe(df, hide_index=True, use_container_width=True)
             if st.button(f"🗑️ Remove", key=f"rm_{i}"):
                 st.session_state["examples"].pop(i)
+                if st.session_state["examples"]:
+                    st.rerun(scope="fragment")
+                # Emptying the list changes the readiness check and Run
+                # button outside the fragment, so refresh the whole page.
                 st.rerun()
 
     if st.button("🗑️ Clear all examples"):
         st.session_state["examples"] = []
         st.session_state["loaded_preset"] = None
+        # Same as above: the preset banner and Run gating live outside.
         st.rerun()
-else:
-    st.warning("⚠️ No examples loaded yet. **Select a preset above** (easiest) or add one manually below.")
+
+
+_examples_fragment()
+
+# Matches "key=value" pairs in a comma-separated attribute string,
+# stripping whitespace in a single C-level scan.
+_ATTR_RE = re.compile(r"\s*([^=,]+?)\s*=\s*([^,]*?)\s*(?:,|$)")
 
 # Manual example builder
 with st.expander("➕ Add a new example manually", expanded=not st.session_state["examples"]):
@@ -277,47 +337,52 @@ with st.expander("➕ Add a new example manually", expanded=not st.session_state
         """
     )
 
-    ex_text = st.text_area(
-        "Example text passage",
-        height=100,
-        key="new_ex_text",
-        placeholder='e.g. ROMEO. But soft! What light through yonder window breaks? It is the east, and Juliet is the sun.',
-    )
-
-    st.markdown("**Define extractions from this text:**")
+    # The row count stays outside the form — changing it has to rerun the
+    # script to add/remove rows. Everything else is form-batched so typing
+    # into the (up to 60) inputs no longer triggers a rerun per widget.
     num_extractions = st.number_input("Number of extractions", min_value=1, max_value=20, value=2, key="num_ext")
 
-    new_extractions = []
-    for idx in range(int(num_extractions)):
-        st.markdown("---")
-        cols = st.columns([1, 2, 2])
-        with cols[0]:
-            ext_class = st.selectbox(f"Class #{idx+1}", available_classes, key=f"ext_class_{idx}")
-        with cols[1]:
-            ext_text = st.text_input(f"Verbatim text #{idx+1}", key=f"ext_text_{idx}", placeholder="Copy exact text from passage")
-        with cols[2]:
-            ext_attrs = st.text_input(f"Attributes #{idx+1}", key=f"ext_attrs_{idx}", placeholder="key1=val1, key2=val2")
-
-        if ext_text.strip():
-            attrs = {}
-            if ext_attrs.strip():
-                for pair in ext_attrs.split(","):
-                    if "=" in pair:
-                        k, v = pair.split("=", 1)
-                        attrs[k.strip()] = v.strip()
-            new_extractions.append({
-                "extraction_class": ext_class,
-                "extraction_text": ext_text.strip(),
-                "attributes": attrs,
-            })
-
-    if st.button("➕ Add this example", type="secondary"):
+    with st.form("new_example_form", clear_on_submit=False):
+        ex_text = st.text_area(
+            "Example text passage",
+            height=100,
+            key="new_ex_text",
+            placeholder='e.g. ROMEO. But soft! What light through yonder window breaks? It is the east, and Juliet is the sun.',
+        )
+
+        st.markdown("**Define extractions from this text:**")
+        new_extractions = []
+        for idx in range(int(num_extractions)):
+            st.markdown("---")
+            cols = st.columns([1, 2, 2])
+            with cols[0]:
+                ext_class = st.selectbox(f"Class #{idx+1}", available_classes, key=f"ext_class_{idx}")
+            with cols[1]:
+                ext_text = st.text_input(f"Verbatim text #{idx+1}", key=f"ext_text_{idx}", placeholder="Copy exact text from passage")
+            with cols[2]:
+                ext_attrs = st.text_input(f"Attributes #{idx+1}", key=f"ext_attrs_{idx}", placeholder="key1=val1, key2=val2")
+
+            if ext_text.strip():
+                attrs = dict(_ATTR_RE.findall(ext_attrs)) if ext_attrs.strip() else {}
+                new_extractions.append({
+                    "extraction_class": ext_class,
+                    "extraction_text": ext_text.strip(),
+                    "attributes": attrs,
+                })
+
+        submitted = st.form_submit_button("➕ Add this example", type="secondary")
+
+    if submitted:
         if not ex_text or not ex_text.strip():
             st.error("Please enter an example text passage.")
         elif not new_extractions:
             st.error("Please fill in at least one extraction with verbatim text.")
         else:
-            bad = [e for e in new_extractions if e["extraction_text"] not in ex_text]
+            # Scan the passage once per distinct snippet — duplicate rows
+            # don't trigger repeated substring searches over a long passage.
+            unique_texts = {e["extraction_text"] for e in new_extractions}
+            found = {t: ex_text.find(t) != -1 for t in unique_texts}
+            bad = [e for e in new_extractions if not found[e["extraction_text"]]]
             if bad:
                 for e in bad:
                     st.warning(f"⚠️ `{e['extraction_text']}` not found verbatim in the example text!")
@@ -333,21 +398,41 @@ with st.expander("➕ Add a new example manually", expanded=not st.session_state
 # ===========================================================================
 st.header("Step 3: Input Document to Extract From")
 
+
+@st.cache_data(ttl=600, max_entries=16, show_spinner="Downloading document...")
+def _fetch_url(url):
+    """Download a plain-text URL once and reuse it across reruns."""
+    with urllib.request.urlopen(url) as resp:
+        return resp.read().decode("utf-8", errors="replace")
+
+
+@st.cache_data(max_entries=16)
+def _decode_upload(raw_bytes):
+    """Decode uploaded file bytes once, keyed by content hash."""
+    return raw_bytes.decode("utf-8", errors="replace")
+
+
 input_method = st.radio("Input source", ["📝 Paste text", "🌐 URL", "📁 Upload file"], horizontal=True)
 
 input_text = None
 if input_method == "📝 Paste text":
     input_text = st.text_area("Paste your document text", height=250, placeholder="Paste the text you want to extract from...")
 elif input_method == "🌐 URL":
-    input_text = st.text_input(
+    doc_url = st.text_input(
         "Document URL",
         placeholder="https://www.gutenberg.org/cache/epub/1513/pg1513.txt",
-        help="Supports any plain-text URL. LangExtract will download and process it.",
+        help="Supports any plain-text URL. The document is downloaded once and cached for 10 minutes.",
     )
+    if doc_url and doc_url.strip():
+        try:
+            input_text = _fetch_url(doc_url.strip())
+            st.caption(f"Fetched {len(input_text):,} characters.")
+        except Exception as e:
+            st.warning(f"Could not fetch URL: {e}")
 else:
     uploaded = st.file_uploader("Upload a text file", type=["txt", "md", "csv"])
     if uploaded is not None:
-        input_text = uploaded.read().decode("utf-8", errors="replace")
+        input_text = _decode_upload(uploaded.getvalue())
         st.text_area("Preview (first 2000 chars)", input_text[:2000], height=200, disabled=True)
 
 
@@ -377,9 +462,17 @@ if not all_ready:
     st.warning("Complete all the steps above before running extraction.")
 
 
-def build_lx_examples():
+@st.cache_resource
+def _preset_lx_examples(preset_name):
+    """Build the lx.data.ExampleData list for a preset once per process.
+
+    Presets are immutable module constants, so the converted objects can be
+    shared across reruns instead of being reallocated on every interaction.
+    """
+    import langextract as lx
+
     lx_examples = []
-    for ex in st.session_state["examples"]:
+    for ex in PRESETS[preset_name]["examples"]:
         extractions = [
             lx.data.Extraction(
                 extraction_class=e["extraction_class"],
@@ -392,42 +485,159 @@ def build_lx_examples():
     return lx_examples
 
 
-if st.button("🚀 Run Extraction", type="primary", disabled=not all_ready, use_container_width=True):
-    lx_examples = build_lx_examples()
+@functools.lru_cache(maxsize=8)
+def _build_examples(examples_tuple):
+    """Convert a canonical examples tuple into lx.data objects, memoized.
+
+    The common case — rerunning with the same examples — hits the cache
+    instead of reallocating every Extraction/ExampleData object.
+    """
+    import langextract as lx
+
+    return [
+        lx.data.ExampleData(
+            text=text,
+            extractions=[
+                lx.data.Extraction(
+                    extraction_class=cls,
+                    extraction_text=txt,
+                    attributes=dict(attrs),
+                )
+                for cls, txt, attrs in extractions
+            ],
+        )
+        for text, extractions in examples_tuple
+    ]
+
+
+def _examples_tuple():
+    """Canonical hashable form of the session examples.
+
+    Doubles as the memoization key for _build_examples and as the
+    examples part of _run_extraction's cache key.
+    """
+    return tuple(
+        (
+            ex["text"],
+            tuple(
+                (
+                    e["extraction_class"],
+                    e["extraction_text"],
+                    tuple(sorted(e.get("attributes", {}).items())),
+                )
+                for e in ex["extractions"]
+            ),
+        )
+        for ex in st.session_state["examples"]
+    )
+
+
+def build_lx_examples():
+    # Fast path: an untouched preset maps straight to its precomputed objects.
+    loaded = st.session_state.get("loaded_preset")
+    if loaded in PRESETS and st.session_state["examples"] == PRESETS[loaded]["examples"]:
+        return _preset_lx_examples(loaded)
+
+    return _build_examples(_examples_tuple())
+
+
+@st.cache_resource
+def _results_dir():
+    """Process-wide scratch directory for result files, removed at exit.
+
+    A fresh mkdtemp per extraction leaked directories for the lifetime of
+    the session; this singleton is created once and reused.
+    """
+    d = tempfile.mkdtemp(prefix="lxstudio_")
+    atexit.register(lambda: shutil.rmtree(d, ignore_errors=True))
+    return d
+
+
+@st.cache_data(show_spinner=False, ttl=3600, max_entries=32)
+def _run_extraction(
+    prompt_description,
+    examples_tuple,
+    input_text,
+    model_id,
+    extraction_passes,
+    max_workers,
+    fence_output,
+    use_schema,
+    model_url,
+    max_char_buffer,
+    _api_key,
+    _lx_examples,
+):
+    """Cached wrapper around lx.extract — identical inputs skip the LLM call.
+
+    Examples are keyed by their canonical tuple (see _examples_tuple); the
+    underscore-prefixed arguments (`_api_key`, the prebuilt `_lx_examples`
+    from build_lx_examples) are excluded from the cache key.
+    """
+    import langextract as lx
 
     extract_kwargs = {
         "text_or_documents": input_text,
-        "prompt_description": prompt_value,
-        "examples": lx_examples,
+        "prompt_description": prompt_description,
+        "examples": _lx_examples,
         "model_id": model_id,
         "extraction_passes": extraction_passes,
         "max_workers": max_workers,
         "fence_output": fence_output,
         "use_schema_constraints": use_schema,
     }
-
-    if api_key:
-        extract_kwargs["api_key"] = api_key
+    if _api_key:
+        extract_kwargs["api_key"] = _api_key
     if model_url:
         extract_kwargs["model_url"] = model_url
     if max_char_buffer > 0:
         extract_kwargs["max_char_buffer"] = max_char_buffer
 
+    return lx.extract(**extract_kwargs)
+
+
+if st.button("🚀 Run Extraction", type="primary", disabled=not all_ready, use_container_width=True):
+    import langextract as lx
+
     with st.spinner("🔄 Running extraction... this may take a moment."):
         try:
-            result = lx.extract(**extract_kwargs)
+            result = _run_extraction(
+                prompt_description=prompt_value,
+                examples_tuple=_examples_tuple(),
+                input_text=input_text,
+                model_id=model_id,
+                extraction_passes=extraction_passes,
+                max_workers=max_workers,
+                fence_output=fence_output,
+                use_schema=use_schema,
+                model_url=model_url,
+                max_char_buffer=max_char_buffer,
+                _api_key=api_key,
+                _lx_examples=build_lx_examples(),
+            )
             st.session_state["extraction_result"] = result
 
-            tmpdir = tempfile.mkdtemp()
-            output_path = os.path.join(tmpdir, "results.jsonl")
-            lx.io.save_annotated_documents([result], output_dir=tmpdir, output_name="results.jsonl")
+            tmpdir = _results_dir()
+            # The scratch directory is shared by every session in the
+            # process, so key the filename on the input text to keep
+            # concurrent extractions from clobbering each other.
+            results_name = f"results_{hashlib.blake2b(input_text.encode('utf-8'), digest_size=8).hexdigest()}.jsonl"
+            output_path = os.path.join(tmpdir, results_name)
+            lx.io.save_annotated_documents([result], output_dir=tmpdir, output_name=results_name)
             st.session_state["results_path"] = output_path
 
             try:
                 html = lx.visualize(output_path)
-                st.session_state["visualization_html"] = html
+                # Persist the blob to disk keyed by content hash; only the
+                # path lives in session state, not the (potentially MBs) HTML.
+                viz_name = f"viz_{hashlib.blake2b(html.encode('utf-8'), digest_size=8).hexdigest()}.html"
+                viz_path = os.path.join(tmpdir, viz_name)
+                if not os.path.exists(viz_path):
+                    with open(viz_path, "w", encoding="utf-8") as f:
+                        f.write(html)
+                st.session_state["visualization_path"] = viz_path
             except Exception:
-                st.session_state["visualization_html"] = None
+                st.session_state["visualization_path"] = None
 
             st.success("🎉 Extraction complete! Scroll down to see results.")
             st.rerun()
@@ -439,55 +649,132 @@ if st.button("🚀 Run Extraction", type="primary", disabled=not all_ready, use_
 # ===========================================================================
 # RESULTS
 # ===========================================================================
-result = st.session_state.get("extraction_result")
-if result is not None:
+def _summarize(extractions):
+    """Class histogram for the metrics row — runs once per result object.
+
+    The summary depends only on the result, not on the filter selection, so
+    it lives in the derived dict rather than being rebuilt per rerun.
+    """
+    counts = Counter(e.extraction_class for e in extractions)
+    return dict(counts), sorted(counts)
+
+
+def _derive_results(result, results_path):
+    """Compute everything the results UI needs from a result, exactly once.
+
+    The returned dict is stored in session state keyed by the result's id,
+    so filter/download interactions re-display without re-enumerating
+    result.extractions or re-reading the JSONL file.
+    """
+    extractions = list(result.extractions)
+    class_counts, all_classes = _summarize(extractions)
+
+    if not (results_path and os.path.exists(results_path)):
+        results_path = None
+
+    json_payload = tuple(
+        (e.extraction_class, e.extraction_text, tuple(sorted((e.attributes or {}).items())))
+        for e in extractions
+    )
+
+    return {
+        "key": id(result),
+        "extractions": extractions,
+        "class_counts": class_counts,
+        "all_classes": all_classes,
+        "results_path": results_path,
+        "json_payload": json_payload,
+    }
+
+
+# Rust-backed serializer when available; stdlib fallback otherwise.
+try:
+    import orjson
+
+    def _dumps(obj):
+        return orjson.dumps(obj)
+except ImportError:
+    def _dumps(obj):
+        return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+
+@st.cache_data(max_entries=8)
+def _extractions_to_json_bytes(payload):
+    """Serialize the download payload once per result (compact, no indent)."""
+    json_data = [
+        {"class": cls, "text": text, "attributes": dict(attrs)}
+        for cls, text, attrs in payload
+    ]
+    return _dumps(json_data)
+
+
+@st.fragment
+def _results_fragment():
+    """Render the results section; filter/download interactions rerun only
+    this fragment instead of the whole script."""
+    result = st.session_state.get("extraction_result")
+    if result is None:
+        return
+
     st.divider()
     st.header("📊 Extraction Results")
 
-    extractions = list(result.extractions)
+    derived = st.session_state.get("derived_results")
+    if derived is None or derived["key"] != id(result):
+        derived = _derive_results(result, st.session_state.get("results_path"))
+        st.session_state["derived_results"] = derived
 
-    class_counts = {}
-    for ext in extractions:
-        class_counts[ext.extraction_class] = class_counts.get(ext.extraction_class, 0) + 1
+    extractions = derived["extractions"]
+    class_counts = derived["class_counts"]
 
     metric_cols = st.columns(min(len(class_counts) + 1, 5))
     metric_cols[0].metric("Total Extractions", len(extractions))
     for i, (cls, count) in enumerate(class_counts.items()):
         metric_cols[(i + 1) % len(metric_cols)].metric(cls, count)
 
-    all_classes = sorted(class_counts.keys())
+    all_classes = derived["all_classes"]
     selected_classes = st.multiselect("Filter by class", all_classes, default=all_classes)
 
-    for ext in extractions:
-        if ext.extraction_class not in selected_classes:
-            continue
-        with st.expander(f"**[{ext.extraction_class}]** {ext.extraction_text[:120]}"):
-            st.markdown(f"**Class:** `{ext.extraction_class}`")
-            st.markdown(f"**Extracted Text:** {ext.extraction_text}")
-            if ext.attributes:
-                st.markdown("**Attributes:**")
-                st.json(ext.attributes)
+    # One virtualized dataframe instead of an expander + markdown widgets per
+    # extraction — results with hundreds of entities render in one message.
+    results_df = pd.DataFrame(
+        [
+            {
+                "class": ext.extraction_class,
+                "text": ext.extraction_text,
+                "attributes": json.dumps(ext.attributes) if ext.attributes else "",
+            }
+            for ext in extractions
+            if ext.extraction_class in selected_classes
+        ]
+    )
+    st.dataframe(results_df, hide_index=True, use_container_width=True)
 
     st.subheader("📥 Download Results")
     dl_cols = st.columns(3)
 
-    results_path = st.session_state.get("results_path")
-    if results_path and os.path.exists(results_path):
-        with open(results_path, "r") as f:
-            jsonl_data = f.read()
-        dl_cols[0].download_button("Download JSONL", data=jsonl_data, file_name="langextract_results.jsonl", mime="application/jsonl")
+    if derived["results_path"] is not None:
+        # Hand download_button the open binary file so Streamlit streams it
+        # instead of holding a full copy of the JSONL in memory.
+        dl_cols[0].download_button("Download JSONL", data=open(derived["results_path"], "rb"), file_name="langextract_results.jsonl", mime="application/jsonl")
 
-    json_data = [{"class": e.extraction_class, "text": e.extraction_text, "attributes": e.attributes} for e in extractions]
-    dl_cols[1].download_button("Download JSON", data=json.dumps(json_data, indent=2), file_name="langextract_results.json", mime="application/json")
+    dl_cols[1].download_button("Download JSON", data=_extractions_to_json_bytes(derived["json_payload"]), file_name="langextract_results.json", mime="application/json")
 
     # Visualization
     st.divider()
     st.header("🎨 Interactive Visualization")
     st.markdown("Entities highlighted in their original text with source grounding (character offsets).")
 
-    html_content = st.session_state.get("visualization_html")
-    if html_content:
-        st.components.v1.html(html_content, height=800, scrolling=True)
-        dl_cols[2].download_button("Download HTML Visualization", data=html_content, file_name="langextract_visualization.html", mime="text/html")
+    viz_path = st.session_state.get("visualization_path")
+    if viz_path and os.path.exists(viz_path):
+        # Off by default: the embedded HTML can be MBs, so it is only read
+        # from disk and sent to the browser when the user asks for it.
+        if st.toggle("Show visualization", value=False):
+            with open(viz_path, "r", encoding="utf-8") as f:
+                st.components.v1.html(f.read(), height=800, scrolling=True)
+        dl_cols[2].download_button("Download HTML Visualization", data=open(viz_path, "rb"), file_name="langextract_visualization.html", mime="text/html")
     else:
         st.info("Visualization could not be generated for this result.")
+
+
+_results_fragment()